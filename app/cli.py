@@ -1,4 +1,7 @@
-from typing import List, Optional
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
 
 
 class CLI:
@@ -18,14 +21,13 @@ class CLI:
         return self._process_answer(answer, valid_answers)
 
     def _process_answer(self, answer: str, valid_answers: List[str]) -> str:
-        if valid_answers and answer not in valid_answers:
-            new_answer = self._prompt(
+        while valid_answers and answer not in valid_answers:
+            answer = self._prompt(
                 f"'{answer}' is not a valid answer."
                 f" Try again or type '{self.EXIT_WORD}'."
             )
-            if new_answer == self.EXIT_WORD:
+            if answer == self.EXIT_WORD:
                 raise self.NoAnswerProvidedError
-            return self._process_answer(new_answer, valid_answers)
         return answer
 
     def _prompt(self, message: str) -> str:
@@ -39,13 +41,52 @@ class CLI:
         return self._process_yes_no_answer(answer)
 
     def _process_yes_no_answer(self, answer: str) -> bool:
-        if answer.lower() in ("y", "yes"):
-            return True
-        if answer.lower() in ("n", "no"):
-            return False
-        new_answer = self._prompt(
-            f"'{answer}' is not a yes-no answer. Try again or type '{self.EXIT_WORD}'."
-        )
-        if new_answer == self.EXIT_WORD:
-            raise self.NoAnswerProvidedError
-        return self._process_yes_no_answer(new_answer)
+        while True:
+            if answer.lower() in ("y", "yes"):
+                return True
+            if answer.lower() in ("n", "no"):
+                return False
+            answer = self._prompt(
+                f"'{answer}' is not a yes-no answer."
+                f" Try again or type '{self.EXIT_WORD}'."
+            )
+            if answer == self.EXIT_WORD:
+                raise self.NoAnswerProvidedError
+
+
+@dataclass
+class ScriptedCLI(CLI):
+    class ScriptExhausted(Exception):
+        pass
+
+    answers: Iterator[str]
+    echo: bool = False
+
+    @classmethod
+    def from_file(cls, filepath: str, echo: bool = False) -> ScriptedCLI:
+        with open(filepath) as f:
+            answers = f.read().splitlines()
+        return cls(iter(answers), echo)
+
+    def print(self, message: str) -> None:
+        if self.echo:
+            super().print(message)
+
+    def _prompt(self, message: str) -> str:
+        try:
+            answer = next(self.answers)
+        except StopIteration:
+            raise self.ScriptExhausted(message)
+        if self.echo:
+            super().print(f"{message} {answer}")
+        return answer
+
+
+@dataclass
+class RecordingCLI(CLI):
+    answers: List[str] = field(default_factory=list)
+
+    def _prompt(self, message: str) -> str:
+        answer = super()._prompt(message)
+        self.answers.append(answer)
+        return answer
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from app.cli import CLI
 from app.editing_session import EditingSession
 from app.flashcard import Collection, Database
+from app.storage import Storage
 
 
 @dataclass
@@ -14,13 +15,17 @@ class CreatingSession:
 
     collection_name: str
     cli: CLI
-    db: Database
+    db: Storage
 
     @classmethod
     def make(
         cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
     ) -> CreatingSession:
         db = Database.from_filepaths(db_filepath, db_schema_filepath)
+        return cls.make_with_storage(args, db, cli)
+
+    @classmethod
+    def make_with_storage(cls, args: Args, db: Storage, cli: CLI) -> CreatingSession:
         return cls(args.collection, cli, db)
 
     def do(self) -> None:
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 
 from app.cli import CLI
 from app.flashcard import Collection, Database
+from app.storage import Storage
 
 
 @dataclass
@@ -13,13 +14,17 @@ class DeletingSession:
 
     collection_name: str
     cli: CLI
-    db: Database
+    db: Storage
 
     @classmethod
     def make(
         cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
     ) -> DeletingSession:
         db = Database.from_filepaths(db_filepath, db_schema_filepath)
+        return cls.make_with_storage(args, db, cli)
+
+    @classmethod
+    def make_with_storage(cls, args: Args, db: Storage, cli: CLI) -> DeletingSession:
         return cls(args.collection, cli, db)
 
     def do(self) -> None:
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 
 from app.cli import CLI
 from app.flashcard import Answer, Collection, Database, Flashcard, Question
+from app.storage import Storage
+from app.tags import TagExpression
 
 
 @dataclass
@@ -20,6 +22,10 @@ class EditingSession:
         cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
     ) -> EditingSession:
         db = Database.from_filepaths(db_filepath, db_schema_filepath)
+        return cls.make_with_storage(args, db, cli)
+
+    @classmethod
+    def make_with_storage(cls, args: Args, db: Storage, cli: CLI) -> EditingSession:
         return cls(db.get_collection(args.collection), cli)
 
     def do(self) -> None:
@@ -29,8 +35,8 @@ class EditingSession:
         else:
             action = self.cli.prompt(
                 "Do you want to add a flashcard, edit an existing one,"
-                " or delete an existing one?",
-                ["add", "edit", "delete"],
+                " delete an existing one, or tag an existing one?",
+                ["add", "edit", "delete", "tag"],
             )
         if action == "edit":
             self._do_editing()
@@ -38,6 +44,8 @@ class EditingSession:
             self._do_adding()
         if action == "delete":
             self._do_deleting()
+        if action == "tag":
+            self._do_tagging()
 
     def _display_all_flashcards_in_collection(self) -> None:
         for flashcard in self.collection:
@@ -140,6 +148,60 @@ class EditingSession:
             except self.cli.NoAnswerProvidedError:
                 break
 
+    def _do_tagging(self) -> None:
+        if len(self.collection) == 0:
+            self.cli.print("There are no flashcards to tag.")
+            return
+        self.cli.print("These are the flashcards in your collection:")
+        self._display_all_flashcards_in_collection()
+        while True:
+            possible_flashcard_id = self.cli.prompt(
+                "Type in the ID of the flashcard you'd like to tag:"
+            )
+            try:
+                flashcard_id = self._validate_flashcard_id(possible_flashcard_id)
+            except ValueError:
+                self.cli.print(
+                    f"The ID '{possible_flashcard_id}' does not match"
+                    " any existing flashcards. Try again!"
+                )
+                continue
+
+            tags = self.collection.get_tags(flashcard_id)
+            if tags:
+                self.cli.print(f"Current tags: {' '.join(tags)}")
+            else:
+                self.cli.print("This flashcard has no tags yet.")
+
+            tag_action = self.cli.prompt(
+                "Would you like to add or remove tags?", ["add", "remove"]
+            )
+            possible_tag_names = self.cli.prompt(
+                "Type in the tags, separated by spaces:"
+            )
+            try:
+                tag_names = TagExpression.split_tag_names(possible_tag_names)
+            except TagExpression.InvalidTagName as e:
+                self.cli.print(
+                    f"'{e}' cannot be used as a tag: tags cannot be 'and', 'or'"
+                    " or 'not', and cannot contain brackets. Try again!"
+                )
+                continue
+            if tag_action == "add":
+                self.collection.tag_flashcard(flashcard_id, tag_names)
+            if tag_action == "remove":
+                self.collection.untag_flashcard(flashcard_id, tag_names)
+
+            try:
+                wants_to_tag_another_one = self.cli.prompt_with_yes_no_question(
+                    f"Tags of flashcard with ID '{flashcard_id}' successfully updated."
+                    " Want to tag another one?"
+                )
+                if not wants_to_tag_another_one:
+                    break
+            except self.cli.NoAnswerProvidedError:
+                break
+
     def _validate_flashcard_id(self, possible_flashcard_id: str) -> int:
         flashcard_id = int(possible_flashcard_id)
         existing_flashcard_ids = [flashcard.id for flashcard in self.collection]
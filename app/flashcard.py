@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from sqlite3 import connect, Connection, Row
-from typing import Generator, List, Optional
+from typing import Dict, Generator, List, Optional, TYPE_CHECKING, Union
+
+from app.tags import TagExpression
+
+if TYPE_CHECKING:
+    from app.storage import Storage
 
 
 @dataclass
@@ -26,6 +31,9 @@ class Answer:
 
 @dataclass
 class Database:
+    CASCADING_TABLES = ("Flashcard", "FlashcardTag")
+    INCREMENTAL_AUTO_VACUUM = 2
+
     filepath: str
     schema_filepath: str
     connection: Connection
@@ -34,13 +42,26 @@ class Database:
     def from_filepaths(cls, filepath: str, schema_filepath: str) -> Database:
         connection = connect(filepath)
         connection.row_factory = Row
+        connection.execute("PRAGMA foreign_keys = ON")
         return cls(filepath, schema_filepath, connection)
 
     def __post_init__(self) -> None:
-        with open(self.schema_filepath) as f:
-            sql = f.read()
         with self.connection:
-            self.connection.executescript(sql)
+            self.connection.executescript(self._read_schema())
+
+    def _read_schema(self) -> str:
+        with open(self.schema_filepath) as f:
+            return f.read()
+
+    def back_up(self, filepath: str) -> None:
+        backup_connection = connect(filepath)
+        try:
+            self.connection.backup(backup_connection)
+        finally:
+            backup_connection.close()
+
+    def close(self) -> None:
+        self.connection.close()
 
     def record_success(self, flashcard_id: int) -> None:
         with self.connection:
@@ -62,6 +83,7 @@ class Database:
 
     def get_collection(self, collection_name: str) -> Collection:
         collection_id = self._get_collection_id(collection_name)
+        collection_data = CollectionData(collection_id, collection_name)
         with self.connection:
             rows = self.connection.execute(
                 "SELECT * FROM Flashcard WHERE CollectionId = :collection_id",
@@ -69,28 +91,53 @@ class Database:
             )
 
             return Collection(
-                CollectionData(
-                    collection_id,
-                    collection_name,
-                ),
+                collection_data,
+                [self._make_flashcard(row, collection_data) for row in rows],
+                self,
+            )
+
+    def get_tagged_flashcards(
+        self, tag_expression: TagExpression, collection_name: Optional[str] = None
+    ) -> TaggedFlashcards:
+        where_clause, tag_params = tag_expression.to_sql()
+        params: Dict[str, Union[str, int]] = dict(tag_params)
+        if collection_name is not None:
+            params["collection_id"] = self._get_collection_id(collection_name)
+            where_clause = (
+                f"({where_clause}) AND Flashcard.CollectionId = :collection_id"
+            )
+        with self.connection:
+            rows = self.connection.execute(
+                "SELECT Flashcard.*, Collection.Name AS CollectionName FROM Flashcard"
+                " INNER JOIN Collection ON Flashcard.CollectionId = Collection.Id"
+                f" WHERE {where_clause}"
+                " ORDER BY Flashcard.Id",
+                params,
+            )
+
+            return TaggedFlashcards(
+                tag_expression,
                 [
-                    Flashcard(
-                        row["Id"],
-                        CollectionData(collection_id, collection_name),
-                        Question(row["Question"]),
-                        Answer(row["Answer"]),
-                        FlashcardHistory(
-                            row["Id"],
-                            row["SuccessfulAttempts"],
-                            row["FailedAttempts"],
-                            self,
-                        ),
+                    self._make_flashcard(
+                        row, CollectionData(row["CollectionId"], row["CollectionName"])
                     )
                     for row in rows
                 ],
-                self,
             )
 
+    def _make_flashcard(self, row: Row, collection_data: CollectionData) -> Flashcard:
+        return Flashcard(
+            row["Id"],
+            collection_data,
+            Question(row["Question"]),
+            Answer(row["Answer"]),
+            FlashcardHistory(
+                row["Id"],
+                row["SuccessfulAttempts"],
+                row["FailedAttempts"],
+            ),
+        )
+
     def _get_collection_id(self, collection_name: str) -> int:
         with self.connection:
             collection_rows = list(
@@ -105,12 +152,14 @@ class Database:
         return collection_rows[0]["Id"]
 
     def does_collection_exist(self, collection_name: str) -> bool:
+        return collection_name in self.get_collection_names()
+
+    def get_collection_names(self) -> List[str]:
         with self.connection:
             collection_rows = list(
                 self.connection.execute("SELECT Name FROM Collection")
             )
-        collection_names = [row["Name"] for row in collection_rows]
-        return collection_name in collection_names
+        return [row["Name"] for row in collection_rows]
 
     def create_collection(self, collection_name: str) -> Collection:
         if self.does_collection_exist(collection_name):
@@ -168,11 +217,15 @@ class Database:
             CollectionData(collection_id, collection_name),
             question,
             answer,
-            FlashcardHistory(flashcard_id, 0, 0, self),
+            FlashcardHistory(flashcard_id, 0, 0),
         )
 
     def delete_flashcard(self, flashcard_id: int) -> None:
         with self.connection:
+            self.connection.execute(
+                "DELETE FROM FlashcardTag WHERE FlashcardId = :flashcard_id",
+                {"flashcard_id": flashcard_id},
+            )
             self.connection.execute(
                 "DELETE FROM Flashcard WHERE Id = :flashcard_id",
                 {"flashcard_id": flashcard_id},
@@ -181,11 +234,15 @@ class Database:
     def delete_collection(self, collection_name: str) -> None:
         collection_id = self._get_collection_id(collection_name)
         with self.connection:
+            self.connection.execute(
+                "DELETE FROM FlashcardTag WHERE FlashcardId IN"
+                " (SELECT Id FROM Flashcard WHERE CollectionId = :collection_id)",
+                {"collection_id": collection_id},
+            )
             self.connection.execute(
                 "DELETE FROM Flashcard WHERE CollectionId = :collection_id",
                 {"collection_id": collection_id},
             )
-        with self.connection:
             self.connection.execute(
                 "DELETE FROM Collection WHERE Id = :collection_id",
                 {"collection_id": collection_id},
@@ -221,21 +278,182 @@ class Database:
                 },
             )
 
+    def tag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO Tag (Name) VALUES (:name)",
+                [{"name": tag_name} for tag_name in tag_names],
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO FlashcardTag (FlashcardId, TagId)"
+                " SELECT :flashcard_id, Id FROM Tag WHERE Name = :name",
+                [
+                    {"flashcard_id": flashcard_id, "name": tag_name}
+                    for tag_name in tag_names
+                ],
+            )
+
+    def untag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM FlashcardTag WHERE FlashcardId = :flashcard_id"
+                " AND TagId = (SELECT Id FROM Tag WHERE Name = :name)",
+                [
+                    {"flashcard_id": flashcard_id, "name": tag_name}
+                    for tag_name in tag_names
+                ],
+            )
+
+    def get_tags(self, flashcard_id: int) -> List[str]:
+        with self.connection:
+            tag_rows = list(
+                self.connection.execute(
+                    "SELECT Tag.Name FROM FlashcardTag"
+                    " INNER JOIN Tag ON FlashcardTag.TagId = Tag.Id"
+                    " WHERE FlashcardTag.FlashcardId = :flashcard_id"
+                    " ORDER BY Tag.Name",
+                    {"flashcard_id": flashcard_id},
+                )
+            )
+        return [row["Name"] for row in tag_rows]
+
+    def get_tag_names(self) -> List[str]:
+        with self.connection:
+            tag_rows = list(self.connection.execute("SELECT Name FROM Tag"))
+        return [row["Name"] for row in tag_rows]
+
+    def check_integrity(self) -> List[str]:
+        with self.connection:
+            rows = list(self.connection.execute("PRAGMA integrity_check"))
+        problems = [row[0] for row in rows]
+        if problems == ["ok"]:
+            return []
+        return problems
+
+    def enable_cascading_deletes(self) -> List[str]:
+        """Rebuilds tables whose foreign keys lack ON DELETE CASCADE."""
+        outdated_tables = [
+            table
+            for table in self.CASCADING_TABLES
+            if self._has_non_cascading_foreign_key(table)
+        ]
+        if not outdated_tables:
+            return []
+
+        with self.connection:
+            old_indexes = [
+                row["name"]
+                for table in outdated_tables
+                for row in self.connection.execute(
+                    "SELECT name FROM sqlite_master"
+                    " WHERE type = 'index' AND tbl_name = :table AND sql IS NOT NULL",
+                    {"table": table},
+                )
+            ]
+
+        script = ["BEGIN;"]
+        script += [
+            f"ALTER TABLE {table} RENAME TO Old{table};" for table in outdated_tables
+        ]
+        script += [f"DROP INDEX {index};" for index in old_indexes]
+        script.append(self._read_schema())
+        for table in outdated_tables:
+            script.append(f"INSERT INTO {table} SELECT * FROM Old{table};")
+            script.append(f"DELETE FROM sqlite_sequence WHERE name = '{table}';")
+            script.append(
+                f"UPDATE sqlite_sequence SET name = '{table}'"
+                f" WHERE name = 'Old{table}';"
+            )
+            script.append(f"DROP TABLE Old{table};")
+        script.append("COMMIT;")
+
+        # Foreign keys must be off while the tables are swapped, and renaming must not
+        # rewrite the references that other tables hold to the renamed ones.
+        self.connection.execute("PRAGMA foreign_keys = OFF")
+        self.connection.execute("PRAGMA legacy_alter_table = ON")
+        try:
+            self.connection.executescript("\n".join(script))
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self.connection.execute("PRAGMA legacy_alter_table = OFF")
+            self.connection.execute("PRAGMA foreign_keys = ON")
+        return outdated_tables
+
+    def _has_non_cascading_foreign_key(self, table: str) -> bool:
+        with self.connection:
+            foreign_key_rows = list(
+                self.connection.execute(f"PRAGMA foreign_key_list({table})")
+            )
+        return any(row["on_delete"] != "CASCADE" for row in foreign_key_rows)
+
+    def delete_orphans(self) -> OrphanCounts:
+        with self.connection:
+            flashcards = self.connection.execute(
+                "DELETE FROM Flashcard WHERE NOT EXISTS (SELECT 1 FROM Collection"
+                " WHERE Collection.Id = Flashcard.CollectionId)"
+            ).rowcount
+            flashcard_tags = self.connection.execute(
+                "DELETE FROM FlashcardTag WHERE NOT EXISTS (SELECT 1 FROM Flashcard"
+                " WHERE Flashcard.Id = FlashcardTag.FlashcardId)"
+                " OR NOT EXISTS (SELECT 1 FROM Tag WHERE Tag.Id = FlashcardTag.TagId)"
+            ).rowcount
+            tags = self.connection.execute(
+                "DELETE FROM Tag WHERE NOT EXISTS"
+                " (SELECT 1 FROM FlashcardTag WHERE FlashcardTag.TagId = Tag.Id)"
+            ).rowcount
+        return OrphanCounts(flashcards, flashcard_tags, tags)
+
+    def optimize(self) -> None:
+        with self.connection:
+            self.connection.execute("ANALYZE")
+            self.connection.execute("PRAGMA optimize")
+
+    def vacuum(self) -> None:
+        """Switches on incremental auto-vacuum if needed, then frees unused pages."""
+        auto_vacuum = self._get_pragma("auto_vacuum")
+        if auto_vacuum != self.INCREMENTAL_AUTO_VACUUM:
+            self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self.connection.execute("VACUUM")
+            return
+        # sqlite3 steps a statement only once, which frees a single page, whereas
+        # executescript runs the pragma to completion.
+        self.connection.executescript("PRAGMA incremental_vacuum;")
+
+    def get_size_in_bytes(self) -> int:
+        return self._get_pragma("page_count") * self._get_pragma("page_size")
+
+    def get_free_bytes(self) -> int:
+        return self._get_pragma("freelist_count") * self._get_pragma("page_size")
+
+    def _get_pragma(self, pragma: str) -> int:
+        with self.connection:
+            return self.connection.execute(f"PRAGMA {pragma}").fetchone()[0]
+
+
+@dataclass
+class OrphanCounts:
+    flashcards: int
+    flashcard_tags: int
+    tags: int
+
+    @property
+    def total(self) -> int:
+        return self.flashcards + self.flashcard_tags + self.tags
+
 
 @dataclass
 class FlashcardHistory:
     flashcard_id: int
     successful_attempts: int
     failed_attempts: int
-    database: Database
 
     def record_success(self) -> None:
         self.successful_attempts += 1
-        self.database.record_success(self.flashcard_id)
 
     def record_failure(self) -> None:
         self.failed_attempts += 1
-        self.database.record_failure(self.flashcard_id)
 
     @property
     def total_attempts(self) -> int:
@@ -258,7 +476,7 @@ class Collection:
 
     collection_data: CollectionData
     flashcards: List[Flashcard]
-    db: Database
+    db: Storage
 
     def __str__(self) -> str:
         return self.collection_data.name
@@ -289,6 +507,30 @@ class Collection:
             flashcard_id, new_question=new_question, new_answer=new_answer
         )
 
+    def tag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        self.db.tag_flashcard(flashcard_id, tag_names)
+
+    def untag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        self.db.untag_flashcard(flashcard_id, tag_names)
+
+    def get_tags(self, flashcard_id: int) -> List[str]:
+        return self.db.get_tags(flashcard_id)
+
+
+@dataclass
+class TaggedFlashcards:
+    tag_expression: TagExpression
+    flashcards: List[Flashcard]
+
+    def __str__(self) -> str:
+        return str(self.tag_expression)
+
+    def __iter__(self) -> Generator[Flashcard, None, None]:
+        yield from self.flashcards
+
+    def __len__(self) -> int:
+        return len(self.flashcards)
+
 
 @dataclass
 class Flashcard:
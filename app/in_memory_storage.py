@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from app.flashcard import (
+    Answer,
+    Collection,
+    CollectionData,
+    Flashcard,
+    FlashcardHistory,
+    Question,
+    TaggedFlashcards,
+)
+from app.storage import Storage
+from app.tags import TagExpression
+
+
+@dataclass
+class InMemoryStorage:
+    _collection_ids: Dict[str, int] = field(default_factory=dict)
+    _collection_names: Dict[int, str] = field(default_factory=dict)
+    _collection_flashcard_ids: Dict[int, List[int]] = field(default_factory=dict)
+    _next_collection_id: int = 1
+
+    _flashcard_rows: Dict[int, int] = field(default_factory=dict)
+    _flashcard_ids: array = field(default_factory=lambda: array("q"))
+    _flashcard_collection_ids: array = field(default_factory=lambda: array("q"))
+    _successful_attempts: array = field(default_factory=lambda: array("q"))
+    _failed_attempts: array = field(default_factory=lambda: array("q"))
+    _questions: List[str] = field(default_factory=list)
+    _answers: List[str] = field(default_factory=list)
+    _flashcard_ids_by_question: Dict[str, Set[int]] = field(default_factory=dict)
+    _next_flashcard_id: int = 1
+
+    _tag_ids: Dict[str, int] = field(default_factory=dict)
+    _tag_names: Dict[int, str] = field(default_factory=dict)
+    _flashcard_tag_ids: Dict[int, Set[int]] = field(default_factory=dict)
+    _next_tag_id: int = 1
+
+    @classmethod
+    def from_storage(cls, storage: Storage) -> InMemoryStorage:
+        in_memory_storage = cls()
+        for collection_name in storage.get_collection_names():
+            collection = storage.get_collection(collection_name)
+            collection_id = collection.collection_data.id
+            in_memory_storage._insert_collection(collection_id, collection_name)
+            for flashcard in collection:
+                in_memory_storage._insert_flashcard(
+                    flashcard.id,
+                    collection_id,
+                    flashcard.question,
+                    flashcard.answer,
+                    flashcard.history.successful_attempts,
+                    flashcard.history.failed_attempts,
+                )
+                in_memory_storage.tag_flashcard(
+                    flashcard.id, storage.get_tags(flashcard.id)
+                )
+        return in_memory_storage
+
+    def record_success(self, flashcard_id: int) -> None:
+        row = self._flashcard_rows.get(flashcard_id)
+        if row is not None:
+            self._successful_attempts[row] += 1
+
+    def record_failure(self, flashcard_id: int) -> None:
+        row = self._flashcard_rows.get(flashcard_id)
+        if row is not None:
+            self._failed_attempts[row] += 1
+
+    def get_collection(self, collection_name: str) -> Collection:
+        collection_id = self._get_collection_id(collection_name)
+        collection_data = CollectionData(collection_id, collection_name)
+        return Collection(
+            collection_data,
+            [
+                self._make_flashcard(flashcard_id, collection_data)
+                for flashcard_id in self._collection_flashcard_ids[collection_id]
+            ],
+            self,
+        )
+
+    def get_tagged_flashcards(
+        self, tag_expression: TagExpression, collection_name: Optional[str] = None
+    ) -> TaggedFlashcards:
+        if collection_name is None:
+            flashcard_ids = sorted(self._flashcard_rows)
+        else:
+            collection_id = self._get_collection_id(collection_name)
+            flashcard_ids = self._collection_flashcard_ids[collection_id]
+        return TaggedFlashcards(
+            tag_expression,
+            [
+                self._make_flashcard(
+                    flashcard_id, self._get_collection_data(flashcard_id)
+                )
+                for flashcard_id in flashcard_ids
+                if tag_expression.matches(self._get_tag_name_set(flashcard_id))
+            ],
+        )
+
+    def _make_flashcard(
+        self, flashcard_id: int, collection_data: CollectionData
+    ) -> Flashcard:
+        row = self._flashcard_rows[flashcard_id]
+        return Flashcard(
+            flashcard_id,
+            collection_data,
+            Question(self._questions[row]),
+            Answer(self._answers[row]),
+            FlashcardHistory(
+                flashcard_id,
+                self._successful_attempts[row],
+                self._failed_attempts[row],
+            ),
+        )
+
+    def _get_collection_data(self, flashcard_id: int) -> CollectionData:
+        row = self._flashcard_rows[flashcard_id]
+        collection_id = self._flashcard_collection_ids[row]
+        return CollectionData(collection_id, self._collection_names[collection_id])
+
+    def _get_collection_id(self, collection_name: str) -> int:
+        try:
+            return self._collection_ids[collection_name]
+        except KeyError:
+            raise Collection.DoesNotExist
+
+    def does_collection_exist(self, collection_name: str) -> bool:
+        return collection_name in self._collection_ids
+
+    def get_collection_names(self) -> List[str]:
+        return list(self._collection_ids)
+
+    def create_collection(self, collection_name: str) -> Collection:
+        if self.does_collection_exist(collection_name):
+            raise Collection.AlreadyExists
+
+        collection_id = self._next_collection_id
+        self._insert_collection(collection_id, collection_name)
+        return Collection(CollectionData(collection_id, collection_name), [], self)
+
+    def _insert_collection(self, collection_id: int, collection_name: str) -> None:
+        self._next_collection_id = max(self._next_collection_id, collection_id + 1)
+        self._collection_ids[collection_name] = collection_id
+        self._collection_names[collection_id] = collection_name
+        self._collection_flashcard_ids[collection_id] = []
+
+    def add_flashcard(
+        self, collection_id: int, question: Question, answer: Answer
+    ) -> Flashcard:
+        if self._flashcard_ids_by_question.get(question.question):
+            raise Flashcard.AlreadyExists
+
+        flashcard_id = self._next_flashcard_id
+        self._insert_flashcard(flashcard_id, collection_id, question, answer, 0, 0)
+        return Flashcard(
+            flashcard_id,
+            CollectionData(collection_id, self._collection_names[collection_id]),
+            question,
+            answer,
+            FlashcardHistory(flashcard_id, 0, 0),
+        )
+
+    def _insert_flashcard(
+        self,
+        flashcard_id: int,
+        collection_id: int,
+        question: Question,
+        answer: Answer,
+        successful_attempts: int,
+        failed_attempts: int,
+    ) -> None:
+        self._next_flashcard_id = max(self._next_flashcard_id, flashcard_id + 1)
+        self._flashcard_rows[flashcard_id] = len(self._flashcard_ids)
+        self._flashcard_ids.append(flashcard_id)
+        self._flashcard_collection_ids.append(collection_id)
+        self._successful_attempts.append(successful_attempts)
+        self._failed_attempts.append(failed_attempts)
+        self._questions.append(question.question)
+        self._answers.append(answer.answer)
+        self._index_question(flashcard_id, question.question)
+        self._collection_flashcard_ids[collection_id].append(flashcard_id)
+
+    def delete_flashcard(self, flashcard_id: int) -> None:
+        row = self._flashcard_rows.pop(flashcard_id, None)
+        if row is None:
+            return
+        self._flashcard_tag_ids.pop(flashcard_id, None)
+        self._unindex_question(flashcard_id, self._questions[row])
+        self._collection_flashcard_ids[self._flashcard_collection_ids[row]].remove(
+            flashcard_id
+        )
+
+        last_row = len(self._flashcard_ids) - 1
+        if row != last_row:
+            moved_flashcard_id = self._flashcard_ids[last_row]
+            self._flashcard_rows[moved_flashcard_id] = row
+            for column in self._columns():
+                column[row] = column[last_row]
+        for column in self._columns():
+            column.pop()
+
+    def _columns(self) -> List:
+        return [
+            self._flashcard_ids,
+            self._flashcard_collection_ids,
+            self._successful_attempts,
+            self._failed_attempts,
+            self._questions,
+            self._answers,
+        ]
+
+    def delete_collection(self, collection_name: str) -> None:
+        collection_id = self._get_collection_id(collection_name)
+        for flashcard_id in list(self._collection_flashcard_ids[collection_id]):
+            self.delete_flashcard(flashcard_id)
+        del self._collection_flashcard_ids[collection_id]
+        del self._collection_names[collection_id]
+        del self._collection_ids[collection_name]
+
+    def edit_flashcard(
+        self,
+        flashcard_id: int,
+        new_question: Optional[str] = None,
+        new_answer: Optional[str] = None,
+    ) -> None:
+        row = self._flashcard_rows.get(flashcard_id)
+        if row is None:
+            return
+        if new_question is not None:
+            self._unindex_question(flashcard_id, self._questions[row])
+            self._index_question(flashcard_id, new_question)
+            self._questions[row] = new_question
+        if new_answer is not None:
+            self._answers[row] = new_answer
+
+    def _index_question(self, flashcard_id: int, question: str) -> None:
+        self._flashcard_ids_by_question.setdefault(question, set()).add(flashcard_id)
+
+    def _unindex_question(self, flashcard_id: int, question: str) -> None:
+        flashcard_ids = self._flashcard_ids_by_question[question]
+        flashcard_ids.discard(flashcard_id)
+        if not flashcard_ids:
+            del self._flashcard_ids_by_question[question]
+
+    def tag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        tag_ids = self._flashcard_tag_ids.setdefault(flashcard_id, set())
+        for tag_name in tag_names:
+            if tag_name not in self._tag_ids:
+                self._tag_ids[tag_name] = self._next_tag_id
+                self._tag_names[self._next_tag_id] = tag_name
+                self._next_tag_id += 1
+            tag_ids.add(self._tag_ids[tag_name])
+
+    def untag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        tag_ids = self._flashcard_tag_ids.get(flashcard_id, set())
+        for tag_name in tag_names:
+            tag_ids.discard(self._tag_ids.get(tag_name, 0))
+
+    def get_tags(self, flashcard_id: int) -> List[str]:
+        return sorted(self._get_tag_name_set(flashcard_id))
+
+    def _get_tag_name_set(self, flashcard_id: int) -> Set[str]:
+        tag_ids = self._flashcard_tag_ids.get(flashcard_id, set())
+        return {self._tag_names[tag_id] for tag_id in tag_ids}
+
+    def get_tag_names(self) -> List[str]:
+        return list(self._tag_ids)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from argparse import Namespace as Args
+from dataclasses import dataclass
+from timeit import repeat
+
+from app.cli import CLI
+from app.flashcard import Database
+from app.tags import TagExpression
+
+
+@dataclass
+class MaintainingSession:
+    COMMAND = "maintain"
+    TIMING_REPEATS = 5
+
+    cli: CLI
+    db: Database
+
+    @classmethod
+    def make(
+        cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
+    ) -> MaintainingSession:
+        db = Database.from_filepaths(db_filepath, db_schema_filepath)
+        return cls(cli, db)
+
+    def do(self) -> None:
+        problems = self.db.check_integrity()
+        if problems:
+            self.cli.print("The integrity check failed, so nothing was changed:")
+            for problem in problems:
+                self.cli.print(f"  {problem}")
+            return
+        self.cli.print("Integrity check passed.")
+
+        size_before = self.db.get_size_in_bytes()
+        seconds_before = self._time_queries()
+
+        rebuilt_tables = self.db.enable_cascading_deletes()
+        if rebuilt_tables:
+            self.cli.print(
+                f"Enabled cascading deletes on: {', '.join(rebuilt_tables)}."
+            )
+
+        orphan_counts = self.db.delete_orphans()
+        self.cli.print(
+            f"Deleted {orphan_counts.flashcards} orphaned flashcards,"
+            f" {orphan_counts.flashcard_tags} orphaned flashcard tags"
+            f" and {orphan_counts.tags} unused tags."
+        )
+
+        self.db.optimize()
+        free_bytes = self.db.get_free_bytes()
+        self.db.vacuum()
+
+        size_after = self.db.get_size_in_bytes()
+        seconds_after = self._time_queries()
+        self.cli.print(
+            f"Vacuumed {free_bytes} bytes of free pages. The database was"
+            f" {size_before} bytes before maintenance and is {size_after} bytes now."
+        )
+        self.cli.print(
+            f"Loading every collection and tag took {seconds_before * 1000:.2f} ms"
+            f" before and {seconds_after * 1000:.2f} ms after."
+        )
+
+    def _time_queries(self) -> float:
+        return min(repeat(self._run_queries, number=1, repeat=self.TIMING_REPEATS))
+
+    def _run_queries(self) -> None:
+        for collection_name in self.db.get_collection_names():
+            self.db.get_collection(collection_name)
+        for tag_name in self.db.get_tag_names():
+            self.db.get_tagged_flashcards(TagExpression.parse(tag_name))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from argparse import Namespace as Args
+from dataclasses import asdict, dataclass
+import json
+from typing import List, Optional
+
+
+@dataclass
+class Recording:
+    """A session's command line and answers, plus a snapshot of the database."""
+
+    command: str
+    collection: Optional[str]
+    tags: Optional[str]
+    do_not_remember: bool
+    answers: List[str]
+    snapshot_filepath: str
+
+    @classmethod
+    def load(cls, filepath: str) -> Recording:
+        with open(filepath) as f:
+            return cls(**json.load(f))
+
+    def save(self, filepath: str) -> None:
+        with open(filepath, "w") as f:
+            json.dump(asdict(self), f, indent=4)
+
+    def to_args(self) -> Args:
+        return Args(
+            command=self.command,
+            collection=self.collection,
+            tags=self.tags,
+            do_not_remember=self.do_not_remember,
+        )
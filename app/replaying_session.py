@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from argparse import Namespace as Args
+from copy import deepcopy
+from dataclasses import dataclass
+import os
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import ClassVar, Dict, Optional, Type, Union
+
+from app.cli import CLI, ScriptedCLI
+from app.creating_session import CreatingSession
+from app.deleting_session import DeletingSession
+from app.editing_session import EditingSession
+from app.flashcard import Collection, Database
+from app.in_memory_storage import InMemoryStorage
+from app.recording import Recording
+from app.storage import Storage
+from app.studying_session import StudyingSession
+
+ReplayableSession = Union[
+    Type[CreatingSession],
+    Type[DeletingSession],
+    Type[EditingSession],
+    Type[StudyingSession],
+]
+
+
+@dataclass
+class ReplayingSession:
+    """Replays a recording from a fresh copy of its snapshot, timing each run."""
+
+    COMMAND = "replay"
+    DEFAULT_ITERATIONS = 1000
+    REPLAYABLE_SESSIONS: ClassVar[Dict[str, ReplayableSession]] = {
+        CreatingSession.COMMAND: CreatingSession,
+        DeletingSession.COMMAND: DeletingSession,
+        EditingSession.COMMAND: EditingSession,
+        StudyingSession.COMMAND: StudyingSession,
+    }
+
+    recording: Recording
+    iterations: int
+    in_memory: bool
+    db_schema_filepath: str
+    cli: CLI
+
+    @classmethod
+    def make(
+        cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
+    ) -> ReplayingSession:
+        recording = Recording.load(args.recording)
+        iterations = args.iterations
+        if iterations is None:
+            iterations = cls.DEFAULT_ITERATIONS
+        return cls(recording, iterations, args.in_memory, db_schema_filepath, cli)
+
+    def do(self) -> None:
+        if self.recording.command not in self.REPLAYABLE_SESSIONS:
+            self.cli.print(
+                f"Sessions of type '{self.recording.command}' cannot be replayed."
+            )
+            return
+
+        with TemporaryDirectory() as directory:
+            try:
+                seconds = self._replay(os.path.join(directory, "replay.db"))
+            except ScriptedCLI.ScriptExhausted as e:
+                self.cli.print(
+                    f"The recording ran out of answers at the prompt '{e}'."
+                    " It may have been cut short."
+                )
+                return
+            except Collection.DoesNotExist:
+                self.cli.print(
+                    f"Collection '{self.recording.collection}' does not exist"
+                    " in the snapshot."
+                )
+                return
+
+        answers = self.iterations * len(self.recording.answers)
+        storage_name = "memory" if self.in_memory else "the database"
+        self.cli.print(
+            f"Replayed the '{self.recording.command}' session {self.iterations} times"
+            f" against {storage_name} in {seconds:.3f} s:"
+            f" {self.iterations / seconds:.1f} sessions/s,"
+            f" {answers / seconds:.1f} answers/s."
+        )
+
+    def _replay(self, working_filepath: str) -> float:
+        session_class = self.REPLAYABLE_SESSIONS[self.recording.command]
+        args = self.recording.to_args()
+        seed: Optional[InMemoryStorage] = None
+        if self.in_memory:
+            copyfile(self.recording.snapshot_filepath, working_filepath)
+            snapshot = Database.from_filepaths(
+                working_filepath, self.db_schema_filepath
+            )
+            seed = InMemoryStorage.from_storage(snapshot)
+            snapshot.close()
+
+        seconds = 0.0
+        for _ in range(self.iterations):
+            storage: Storage
+            if seed is not None:
+                storage = deepcopy(seed)
+            else:
+                copyfile(self.recording.snapshot_filepath, working_filepath)
+                storage = Database.from_filepaths(
+                    working_filepath, self.db_schema_filepath
+                )
+            cli = ScriptedCLI(iter(self.recording.answers))
+
+            start = perf_counter()
+            session = session_class.make_with_storage(args, storage, cli)
+            session.do()
+            seconds += perf_counter() - start
+
+            if isinstance(storage, Database):
+                storage.close()
+        return seconds
@@ -1,6 +1,15 @@
 from app.creating_session import CreatingSession
 from app.deleting_session import DeletingSession
 from app.editing_session import EditingSession
+from app.maintaining_session import MaintainingSession
+from app.replaying_session import ReplayingSession
 from app.studying_session import StudyingSession
 
-__all__ = ["CreatingSession", "DeletingSession", "EditingSession", "StudyingSession"]
+__all__ = [
+    "CreatingSession",
+    "DeletingSession",
+    "EditingSession",
+    "MaintainingSession",
+    "ReplayingSession",
+    "StudyingSession",
+]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import List, Optional, Protocol
+
+from app.flashcard import Answer, Collection, Flashcard, Question, TaggedFlashcards
+from app.tags import TagExpression
+
+
+class Storage(Protocol):
+    def record_success(self, flashcard_id: int) -> None:
+        ...
+
+    def record_failure(self, flashcard_id: int) -> None:
+        ...
+
+    def get_collection(self, collection_name: str) -> Collection:
+        ...
+
+    def get_tagged_flashcards(
+        self, tag_expression: TagExpression, collection_name: Optional[str] = None
+    ) -> TaggedFlashcards:
+        ...
+
+    def does_collection_exist(self, collection_name: str) -> bool:
+        ...
+
+    def get_collection_names(self) -> List[str]:
+        ...
+
+    def create_collection(self, collection_name: str) -> Collection:
+        ...
+
+    def add_flashcard(
+        self, collection_id: int, question: Question, answer: Answer
+    ) -> Flashcard:
+        ...
+
+    def delete_flashcard(self, flashcard_id: int) -> None:
+        ...
+
+    def delete_collection(self, collection_name: str) -> None:
+        ...
+
+    def edit_flashcard(
+        self,
+        flashcard_id: int,
+        new_question: Optional[str] = None,
+        new_answer: Optional[str] = None,
+    ) -> None:
+        ...
+
+    def tag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        ...
+
+    def untag_flashcard(self, flashcard_id: int, tag_names: List[str]) -> None:
+        ...
+
+    def get_tags(self, flashcard_id: int) -> List[str]:
+        ...
+
+    def get_tag_names(self) -> List[str]:
+        ...
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from argparse import Namespace as Args
 from dataclasses import dataclass
+from typing import Union
 
 from app.cli import CLI
-from app.flashcard import Collection, Database, Flashcard
+from app.flashcard import Collection, Database, Flashcard, TaggedFlashcards
+from app.storage import Storage
+from app.tags import TagExpression
 
 
 @dataclass
@@ -12,6 +15,7 @@ class StudyInstance:
     flashcard: Flashcard
     cli: CLI
     record_results: bool
+    db: Storage
 
     def do(self) -> None:
         attempted_answer = self.cli.prompt(str(self.flashcard.question))
@@ -24,10 +28,12 @@ class StudyInstance:
         self.cli.print("Correct!")
         if self.record_results:
             self.flashcard.history.record_success()
+            self.db.record_success(self.flashcard.id)
 
     def _handle_failure(self) -> None:
         if self.record_results:
             self.flashcard.history.record_failure()
+            self.db.record_failure(self.flashcard.id)
         try:
             message = "Incorrect. Would you like to see the answer?"
             wants_to_see_answer = self.cli.prompt_with_yes_no_question(message)
@@ -41,23 +47,44 @@ class StudyInstance:
 class StudyingSession:
     COMMAND = "study"
 
-    collection: Collection
+    collection: Union[Collection, TaggedFlashcards]
     cli: CLI
     record_results: bool
+    db: Storage
 
     @classmethod
     def make(
         cls, args: Args, db_filepath: str, db_schema_filepath: str, cli: CLI
     ) -> StudyingSession:
         db = Database.from_filepaths(db_filepath, db_schema_filepath)
-        return cls(db.get_collection(args.collection), cli, not args.do_not_remember)
+        return cls.make_with_storage(args, db, cli)
+
+    @classmethod
+    def make_with_storage(cls, args: Args, db: Storage, cli: CLI) -> StudyingSession:
+        record_results = not args.do_not_remember
+        if args.tags is not None:
+            tag_expression = TagExpression.parse(args.tags)
+            tagged_flashcards = db.get_tagged_flashcards(
+                tag_expression, collection_name=args.collection
+            )
+            return cls(tagged_flashcards, cli, record_results, db)
+        return cls(db.get_collection(args.collection), cli, record_results, db)
 
     def do(self) -> None:
-        self.cli.print(
-            f"The collection '{self.collection}' has {len(self.collection)} flashcards."
-        )
+        if isinstance(self.collection, TaggedFlashcards):
+            self.cli.print(
+                f"There are {len(self.collection)} flashcards"
+                f" matching the tags '{self.collection}'."
+            )
+        else:
+            self.cli.print(
+                f"The collection '{self.collection}'"
+                f" has {len(self.collection)} flashcards."
+            )
 
         for flashcard in self.collection:
-            study_instance = StudyInstance(flashcard, self.cli, self.record_results)
+            study_instance = StudyInstance(
+                flashcard, self.cli, self.record_results, self.db
+            )
             study_instance.do()
             self.cli.empty_line()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from typing import AbstractSet, Dict, List, Tuple, Union
+
+TagNode = Union["TagAtom", "TagNot", "TagAnd", "TagOr"]
+
+
+@dataclass
+class TagAtom:
+    name: str
+
+    def to_sql(self, params: Dict[str, str]) -> str:
+        param_name = f"tag_{len(params)}"
+        params[param_name] = self.name
+        return (
+            "Flashcard.Id IN ("
+            "SELECT FlashcardTag.FlashcardId FROM FlashcardTag"
+            " INNER JOIN Tag ON FlashcardTag.TagId = Tag.Id"
+            f" WHERE Tag.Name = :{param_name})"
+        )
+
+    def matches(self, tag_names: AbstractSet[str]) -> bool:
+        return self.name in tag_names
+
+
+@dataclass
+class TagNot:
+    operand: TagNode
+
+    def to_sql(self, params: Dict[str, str]) -> str:
+        return f"NOT ({self.operand.to_sql(params)})"
+
+    def matches(self, tag_names: AbstractSet[str]) -> bool:
+        return not self.operand.matches(tag_names)
+
+
+@dataclass
+class TagAnd:
+    operands: List[TagNode]
+
+    def to_sql(self, params: Dict[str, str]) -> str:
+        return " AND ".join(f"({operand.to_sql(params)})" for operand in self.operands)
+
+    def matches(self, tag_names: AbstractSet[str]) -> bool:
+        return all(operand.matches(tag_names) for operand in self.operands)
+
+
+@dataclass
+class TagOr:
+    operands: List[TagNode]
+
+    def to_sql(self, params: Dict[str, str]) -> str:
+        return " OR ".join(f"({operand.to_sql(params)})" for operand in self.operands)
+
+    def matches(self, tag_names: AbstractSet[str]) -> bool:
+        return any(operand.matches(tag_names) for operand in self.operands)
+
+
+@dataclass
+class TagExpression:
+    """A tag expression such as "verb AND (french OR german) AND NOT irregular"."""
+
+    KEYWORDS = ("AND", "OR", "NOT")
+
+    class InvalidExpression(Exception):
+        pass
+
+    class InvalidTagName(Exception):
+        pass
+
+    expression: str
+    root: TagNode
+
+    @classmethod
+    def parse(cls, expression: str) -> TagExpression:
+        parser = _TagExpressionParser(_tokenise(expression))
+        root = parser.parse_or()
+        if not parser.is_finished():
+            raise cls.InvalidExpression(f"Unexpected '{parser.peek()}'.")
+        return cls(expression, root)
+
+    @classmethod
+    def split_tag_names(cls, text: str) -> List[str]:
+        tag_names = text.split()
+        for tag_name in tag_names:
+            if tag_name.upper() in cls.KEYWORDS or re.search(r"[()]", tag_name):
+                raise cls.InvalidTagName(tag_name)
+        return tag_names
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def to_sql(self) -> Tuple[str, Dict[str, str]]:
+        """Returns a WHERE clause over the Flashcard table and its parameters."""
+        params: Dict[str, str] = {}
+        return self.root.to_sql(params), params
+
+    def matches(self, tag_names: AbstractSet[str]) -> bool:
+        return self.root.matches(tag_names)
+
+
+def _tokenise(expression: str) -> List[str]:
+    return re.findall(r"\(|\)|[^\s()]+", expression)
+
+
+@dataclass
+class _TagExpressionParser:
+    tokens: List[str]
+    position: int = 0
+
+    def is_finished(self) -> bool:
+        return self.position == len(self.tokens)
+
+    def peek(self) -> str:
+        if self.is_finished():
+            raise TagExpression.InvalidExpression("Tag expression ended unexpectedly.")
+        return self.tokens[self.position]
+
+    def _peek_keyword(self) -> str:
+        if self.is_finished():
+            return ""
+        return self.tokens[self.position].upper()
+
+    def _advance(self) -> str:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse_or(self) -> TagNode:
+        operands = [self._parse_and()]
+        while self._peek_keyword() == "OR":
+            self._advance()
+            operands.append(self._parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        return TagOr(operands)
+
+    def _parse_and(self) -> TagNode:
+        operands = [self._parse_not()]
+        while self._peek_keyword() == "AND":
+            self._advance()
+            operands.append(self._parse_not())
+        if len(operands) == 1:
+            return operands[0]
+        return TagAnd(operands)
+
+    def _parse_not(self) -> TagNode:
+        if self._peek_keyword() == "NOT":
+            self._advance()
+            return TagNot(self._parse_not())
+        return self._parse_atom()
+
+    def _parse_atom(self) -> TagNode:
+        token = self._advance()
+        if token == "(":
+            node = self.parse_or()
+            if self._advance() != ")":
+                raise TagExpression.InvalidExpression("Missing closing bracket.")
+            return node
+        if token == ")" or token.upper() in TagExpression.KEYWORDS:
+            raise TagExpression.InvalidExpression(
+                f"Expected a tag name but found '{token}'."
+            )
+        return TagAtom(token)
@@ -1,3 +1,5 @@
+PRAGMA auto_vacuum = INCREMENTAL;
+
 CREATE TABLE IF NOT EXISTS Collection (
     Id INTEGER PRIMARY KEY AUTOINCREMENT,
     Name STRING NOT NULL
@@ -10,5 +12,24 @@ CREATE TABLE IF NOT EXISTS Flashcard (
     Answer STRING NOT NULL,
     SuccessfulAttempts INTEGER NOT NULL DEFAULT 0,
     FailedAttempts INTEGER NOT NULL DEFAULT 0,
-    FOREIGN KEY(CollectionId) REFERENCES Collection(Id)
+    FOREIGN KEY(CollectionId) REFERENCES Collection(Id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS FlashcardCollectionIdIndex ON Flashcard (CollectionId);
+
+CREATE INDEX IF NOT EXISTS FlashcardQuestionIndex ON Flashcard (Question);
+
+CREATE TABLE IF NOT EXISTS Tag (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name STRING NOT NULL UNIQUE
 );
+
+CREATE TABLE IF NOT EXISTS FlashcardTag (
+    FlashcardId INTEGER NOT NULL,
+    TagId INTEGER NOT NULL,
+    PRIMARY KEY(FlashcardId, TagId),
+    FOREIGN KEY(FlashcardId) REFERENCES Flashcard(Id) ON DELETE CASCADE,
+    FOREIGN KEY(TagId) REFERENCES Tag(Id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS FlashcardTagTagIdIndex ON FlashcardTag (TagId, FlashcardId);
@@ -1,14 +1,19 @@
 from argparse import ArgumentParser
 from argparse import Namespace as Args
+import os
 
-from app.cli import CLI
-from app.flashcard import Collection
+from app.cli import CLI, RecordingCLI, ScriptedCLI
+from app.flashcard import Collection, Database
+from app.recording import Recording
 from app.sessions import (
     CreatingSession,
     DeletingSession,
     EditingSession,
+    MaintainingSession,
+    ReplayingSession,
     StudyingSession,
 )
+from app.tags import TagExpression
 
 DB_FILEPATH = "db/data.db"
 DB_SCHEMA_FILEPATH = "db/schema.sql"
@@ -19,12 +24,20 @@ def prepare_arg_parser() -> ArgumentParser:
     parser.add_argument(
         "command",
         type=str,
-        help="The command: 'study', 'create' or 'edit'.",
+        help="The command: 'study', 'create', 'edit', 'delete', 'maintain'"
+        " or 'replay'.",
     )
     parser.add_argument(
         "collection",
         type=str,
-        help="The name of the collection.",
+        nargs="?",
+        help="The name of the collection. Optional when studying with --tags.",
+    )
+    parser.add_argument(
+        "--tags",
+        type=str,
+        help="Study the flashcards matching a tag expression, across all"
+        " collections unless one is given, e.g. 'verb AND (french OR german)'.",
     )
     parser.add_argument(
         "--do-not-remember",
@@ -32,6 +45,35 @@ def prepare_arg_parser() -> ArgumentParser:
         help="Makes it a study session where your scores will not be recorded."
         " False by default.",
     )
+    scripting_group = parser.add_mutually_exclusive_group()
+    scripting_group.add_argument(
+        "--script",
+        type=str,
+        help="Read the answers from this file, one per line, instead of the keyboard.",
+    )
+    scripting_group.add_argument(
+        "--record",
+        type=str,
+        help="Record the session to this file so that it can be replayed. A snapshot"
+        " of the database is saved next to it.",
+    )
+    parser.add_argument(
+        "--recording",
+        type=str,
+        help="The recording to replay. Required for 'replay'.",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        help="How many times to replay the recording."
+        f" {ReplayingSession.DEFAULT_ITERATIONS} by default.",
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="Replay against an in-memory copy of the snapshot instead of the"
+        " database. False by default.",
+    )
     return parser
 
 
@@ -42,13 +84,81 @@ def main(args: Args) -> None:
         CreatingSession.COMMAND,
         EditingSession.COMMAND,
         DeletingSession.COMMAND,
+        MaintainingSession.COMMAND,
+        ReplayingSession.COMMAND,
     ]
     if args.command not in commands:
         cli.print(
             f"Unrecognised command '{args.command}'. Run flashcards --help for usage."
         )
         return
+    needs_collection = args.command not in (
+        MaintainingSession.COMMAND,
+        ReplayingSession.COMMAND,
+    ) and not (args.command == StudyingSession.COMMAND and args.tags is not None)
+    if args.collection is None and needs_collection:
+        cli.print("A collection is required. Run flashcards --help for usage.")
+        return
+    if args.tags is not None and args.command != StudyingSession.COMMAND:
+        cli.print("Only the 'study' command accepts --tags.")
+        return
+    replay_options_given = (
+        args.recording is not None or args.iterations is not None or args.in_memory
+    )
+    if replay_options_given and args.command != ReplayingSession.COMMAND:
+        cli.print(
+            "Only the 'replay' command accepts --recording, --iterations"
+            " and --in-memory."
+        )
+        return
+    if args.command == ReplayingSession.COMMAND and args.recording is None:
+        cli.print("A recording is required. Run flashcards --help for usage.")
+        return
+    if args.iterations is not None and args.iterations < 1:
+        cli.print("The number of iterations must be at least 1.")
+        return
 
+    if args.script is not None:
+        try:
+            scripted_cli = ScriptedCLI.from_file(args.script, echo=True)
+        except FileNotFoundError:
+            cli.print(f"The script '{args.script}' does not exist.")
+            return
+        try:
+            run_command(args, scripted_cli)
+        except ScriptedCLI.ScriptExhausted as e:
+            cli.print(f"The script ran out of answers at the prompt '{e}'.")
+        return
+    if args.record is not None:
+        if args.command not in ReplayingSession.REPLAYABLE_SESSIONS:
+            cli.print(f"Sessions of type '{args.command}' cannot be recorded.")
+            return
+        record_session(args)
+        return
+    run_command(args, cli)
+
+
+def record_session(args: Args) -> None:
+    snapshot_filepath = os.path.abspath(f"{args.record}.db")
+    db = Database.from_filepaths(DB_FILEPATH, DB_SCHEMA_FILEPATH)
+    db.back_up(snapshot_filepath)
+    db.close()
+    recording_cli = RecordingCLI()
+    try:
+        run_command(args, recording_cli)
+    finally:
+        recording = Recording(
+            args.command,
+            args.collection,
+            args.tags,
+            args.do_not_remember,
+            recording_cli.answers,
+            snapshot_filepath,
+        )
+        recording.save(args.record)
+
+
+def run_command(args: Args, cli: CLI) -> None:
     if args.command == StudyingSession.COMMAND:
         try:
             studying_session = StudyingSession.make(
@@ -59,6 +169,9 @@ def main(args: Args) -> None:
         except Collection.DoesNotExist:
             cli.print(f"Collection '{args.collection}' does not yet exist.")
             return
+        except TagExpression.InvalidExpression as e:
+            cli.print(f"Invalid tag expression '{args.tags}': {e}")
+            return
     if args.command == CreatingSession.COMMAND:
         creating_session = CreatingSession.make(
             args, DB_FILEPATH, DB_SCHEMA_FILEPATH, cli
@@ -80,6 +193,21 @@ def main(args: Args) -> None:
             args, DB_FILEPATH, DB_SCHEMA_FILEPATH, cli
         )
         deleting_session.do()
+        return
+    if args.command == MaintainingSession.COMMAND:
+        maintaining_session = MaintainingSession.make(
+            args, DB_FILEPATH, DB_SCHEMA_FILEPATH, cli
+        )
+        maintaining_session.do()
+        return
+    if args.command == ReplayingSession.COMMAND:
+        try:
+            replaying_session = ReplayingSession.make(
+                args, DB_FILEPATH, DB_SCHEMA_FILEPATH, cli
+            )
+            replaying_session.do()
+        except FileNotFoundError as e:
+            cli.print(f"The file '{e.filename}' does not exist.")
 
 
 if __name__ == "__main__":
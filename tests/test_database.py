@@ -0,0 +1,144 @@
+import os
+from pathlib import Path
+import sqlite3
+from typing import List
+
+import pytest
+
+from app.flashcard import Answer, Database, Question
+
+DB_SCHEMA_FILEPATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "db", "schema.sql"
+)
+
+BASELINE_SCHEMA = """
+CREATE TABLE Collection (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name STRING NOT NULL
+);
+
+CREATE TABLE Flashcard (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    CollectionId INTEGER NOT NULL,
+    Question STRING NOT NULL,
+    Answer STRING NOT NULL,
+    SuccessfulAttempts INTEGER NOT NULL DEFAULT 0,
+    FailedAttempts INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY(CollectionId) REFERENCES Collection(Id)
+);
+"""
+
+TAGGED_SCHEMA = (
+    BASELINE_SCHEMA
+    + """
+CREATE INDEX FlashcardCollectionIdIndex ON Flashcard (CollectionId);
+
+CREATE INDEX FlashcardQuestionIndex ON Flashcard (Question);
+
+CREATE TABLE Tag (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name STRING NOT NULL UNIQUE
+);
+
+CREATE TABLE FlashcardTag (
+    FlashcardId INTEGER NOT NULL,
+    TagId INTEGER NOT NULL,
+    PRIMARY KEY(FlashcardId, TagId),
+    FOREIGN KEY(FlashcardId) REFERENCES Flashcard(Id),
+    FOREIGN KEY(TagId) REFERENCES Tag(Id)
+) WITHOUT ROWID;
+
+CREATE INDEX FlashcardTagTagIdIndex ON FlashcardTag (TagId, FlashcardId);
+"""
+)
+
+
+def _make_old_database(filepath: Path, schema: str) -> None:
+    connection = sqlite3.connect(filepath)
+    connection.executescript(schema)
+    with connection:
+        connection.execute("INSERT INTO Collection (Name) VALUES ('french')")
+        connection.executemany(
+            "INSERT INTO Flashcard (CollectionId, Question, Answer, SuccessfulAttempts)"
+            " VALUES (?, ?, ?, ?)",
+            [(1, f"q{i}", f"a{i}", i) for i in range(10)],
+        )
+        # Leaves a gap at the end of the AUTOINCREMENT sequence.
+        connection.execute("DELETE FROM Flashcard WHERE Id = 10")
+        connection.execute(
+            "INSERT INTO Flashcard (CollectionId, Question, Answer)"
+            " VALUES (99, 'orphan', 'orphan')"
+        )
+    connection.close()
+
+
+def _get_flashcard_rows(database: Database) -> List[tuple]:
+    return [
+        tuple(row)
+        for row in database.connection.execute(
+            "SELECT * FROM Flashcard WHERE CollectionId != 99 ORDER BY Id"
+        )
+    ]
+
+
+def _get_pragma(database: Database, pragma: str) -> int:
+    return database.connection.execute(f"PRAGMA {pragma}").fetchone()[0]
+
+
+def _get_flashcard_sequence(database: Database) -> int:
+    return database.connection.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'Flashcard'"
+    ).fetchone()[0]
+
+
+@pytest.mark.parametrize(
+    "schema, rebuilt_tables",
+    [
+        (BASELINE_SCHEMA, ["Flashcard"]),
+        (TAGGED_SCHEMA, ["Flashcard", "FlashcardTag"]),
+    ],
+)
+def test_enable_cascading_deletes_and_delete_orphans(
+    tmp_path: Path, schema: str, rebuilt_tables: List[str]
+) -> None:
+    filepath = tmp_path / "data.db"
+    _make_old_database(filepath, schema)
+    database = Database.from_filepaths(str(filepath), DB_SCHEMA_FILEPATH)
+    database.tag_flashcard(1, ["verb"])
+    rows_before = _get_flashcard_rows(database)
+
+    assert database.enable_cascading_deletes() == rebuilt_tables
+    orphan_counts = database.delete_orphans()
+
+    assert orphan_counts.flashcards == 1
+    assert _get_flashcard_rows(database) == rows_before
+    assert database.get_tags(1) == ["verb"]
+    assert _get_flashcard_sequence(database) == 11
+    for table in Database.CASCADING_TABLES:
+        foreign_keys = database.connection.execute(f"PRAGMA foreign_key_list({table})")
+        assert {row["on_delete"] for row in foreign_keys} == {"CASCADE"}
+    assert list(database.connection.execute("PRAGMA foreign_key_check")) == []
+    assert database.enable_cascading_deletes() == []
+
+    added = database.add_flashcard(1, Question("new"), Answer("new"))
+    assert added.id == 12
+    database.delete_collection("french")
+    assert list(database.connection.execute("SELECT * FROM FlashcardTag")) == []
+
+
+def test_vacuum_frees_every_free_page(tmp_path: Path) -> None:
+    database = Database.from_filepaths(str(tmp_path / "data.db"), DB_SCHEMA_FILEPATH)
+    collection = database.create_collection("french")
+    with database.connection:
+        database.connection.executemany(
+            "INSERT INTO Flashcard (CollectionId, Question, Answer) VALUES (?, ?, ?)",
+            [(collection.collection_data.id, f"q{i}" * 20, "a") for i in range(5000)],
+        )
+    database.delete_collection("french")
+    page_count_before = _get_pragma(database, "page_count")
+    assert _get_pragma(database, "freelist_count") > 1
+
+    database.vacuum()
+
+    assert _get_pragma(database, "freelist_count") == 0
+    assert _get_pragma(database, "page_count") < page_count_before
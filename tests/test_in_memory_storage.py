@@ -0,0 +1,168 @@
+import os
+from typing import Callable, List
+
+import pytest
+
+from app.flashcard import Answer, Collection, Database, Flashcard, Question
+from app.in_memory_storage import InMemoryStorage
+from app.storage import Storage
+from app.tags import TagExpression
+
+DB_SCHEMA_FILEPATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "db", "schema.sql"
+)
+
+
+def make_database() -> Database:
+    return Database.from_filepaths(":memory:", DB_SCHEMA_FILEPATH)
+
+
+@pytest.fixture(params=[make_database, InMemoryStorage], ids=["database", "memory"])
+def storage(request: pytest.FixtureRequest) -> Storage:
+    make_storage: Callable[[], Storage] = request.param
+    return make_storage()
+
+
+def _get_questions(storage: Storage, collection_name: str) -> List[str]:
+    return [str(f.question) for f in storage.get_collection(collection_name)]
+
+
+def test_creating_collections(storage: Storage) -> None:
+    collection = storage.create_collection("french")
+
+    assert str(collection) == "french"
+    assert len(collection) == 0
+    assert storage.does_collection_exist("french")
+    assert not storage.does_collection_exist("german")
+    assert storage.get_collection_names() == ["french"]
+    with pytest.raises(Collection.AlreadyExists):
+        storage.create_collection("french")
+    with pytest.raises(Collection.DoesNotExist):
+        storage.get_collection("german")
+
+
+def test_adding_and_deleting_flashcards(storage: Storage) -> None:
+    collection = storage.create_collection("french")
+    collection.add_flashcard(Question("manger"), Answer("to eat"))
+    collection.add_flashcard(Question("boire"), Answer("to drink"))
+    german = storage.create_collection("german")
+    with pytest.raises(Flashcard.AlreadyExists):
+        german.add_flashcard(Question("manger"), Answer("to eat"))
+
+    flashcards = list(storage.get_collection("french"))
+    assert [str(f.question) for f in flashcards] == ["manger", "boire"]
+    assert [str(f.answer) for f in flashcards] == ["to eat", "to drink"]
+    assert {f.collection_data.name for f in flashcards} == {"french"}
+
+    storage.delete_flashcard(flashcards[0].id)
+    storage.delete_flashcard(flashcards[0].id)
+    assert _get_questions(storage, "french") == ["boire"]
+
+
+def test_editing_flashcards(storage: Storage) -> None:
+    collection = storage.create_collection("french")
+    flashcard_id = storage.add_flashcard(
+        collection.collection_data.id, Question("manger"), Answer("to eat")
+    ).id
+
+    storage.edit_flashcard(flashcard_id, new_question="boire")
+    storage.edit_flashcard(flashcard_id, new_answer="to drink")
+    storage.edit_flashcard(flashcard_id, new_question="voir", new_answer="to see")
+    storage.edit_flashcard(flashcard_id + 100, new_question="unknown")
+
+    [flashcard] = storage.get_collection("french")
+    assert (str(flashcard.question), str(flashcard.answer)) == ("voir", "to see")
+    storage.add_flashcard(
+        collection.collection_data.id, Question("manger"), Answer("to eat")
+    )
+
+
+def test_recording_attempts(storage: Storage) -> None:
+    collection = storage.create_collection("french")
+    flashcard_id = storage.add_flashcard(
+        collection.collection_data.id, Question("manger"), Answer("to eat")
+    ).id
+
+    storage.record_success(flashcard_id)
+    storage.record_success(flashcard_id)
+    storage.record_failure(flashcard_id)
+    storage.record_success(flashcard_id + 100)
+    storage.record_failure(flashcard_id + 100)
+
+    [flashcard] = storage.get_collection("french")
+    assert flashcard.history.successful_attempts == 2
+    assert flashcard.history.failed_attempts == 1
+    assert flashcard.history.total_attempts == 3
+
+
+def test_tagging_flashcards(storage: Storage) -> None:
+    french = storage.create_collection("french")
+    german = storage.create_collection("german")
+    manger = storage.add_flashcard(
+        french.collection_data.id, Question("manger"), Answer("to eat")
+    )
+    chat = storage.add_flashcard(
+        french.collection_data.id, Question("chat"), Answer("cat")
+    )
+    essen = storage.add_flashcard(
+        german.collection_data.id, Question("essen"), Answer("to eat")
+    )
+
+    storage.tag_flashcard(manger.id, ["verb", "regular"])
+    storage.tag_flashcard(manger.id, ["verb"])
+    storage.tag_flashcard(chat.id, ["noun"])
+    storage.tag_flashcard(essen.id, ["verb", "irregular"])
+    storage.untag_flashcard(essen.id, ["irregular", "unknown"])
+
+    assert storage.get_tags(manger.id) == ["regular", "verb"]
+    assert storage.get_tags(essen.id) == ["verb"]
+    assert sorted(storage.get_tag_names()) == ["irregular", "noun", "regular", "verb"]
+
+    verbs = storage.get_tagged_flashcards(TagExpression.parse("verb"))
+    assert [f.id for f in verbs] == [manger.id, essen.id]
+    assert [f.collection_data.name for f in verbs] == ["french", "german"]
+    french_verbs = storage.get_tagged_flashcards(
+        TagExpression.parse("verb AND NOT regular OR noun"), "french"
+    )
+    assert [f.id for f in french_verbs] == [chat.id]
+    with pytest.raises(Collection.DoesNotExist):
+        storage.get_tagged_flashcards(TagExpression.parse("verb"), "spanish")
+
+
+def test_deleting_collections(storage: Storage) -> None:
+    french = storage.create_collection("french")
+    german = storage.create_collection("german")
+    manger = storage.add_flashcard(
+        french.collection_data.id, Question("manger"), Answer("to eat")
+    )
+    storage.add_flashcard(german.collection_data.id, Question("essen"), Answer("eat"))
+    storage.tag_flashcard(manger.id, ["verb"])
+
+    storage.delete_collection("french")
+
+    assert storage.get_collection_names() == ["german"]
+    assert _get_questions(storage, "german") == ["essen"]
+    assert list(storage.get_tagged_flashcards(TagExpression.parse("verb"))) == []
+    with pytest.raises(Collection.DoesNotExist):
+        storage.delete_collection("french")
+    storage.create_collection("french").add_flashcard(
+        Question("manger"), Answer("to eat")
+    )
+
+
+def test_editing_a_question_into_a_duplicate_and_deleting_both(
+    storage: Storage,
+) -> None:
+    collection = storage.create_collection("french")
+    collection_id = collection.collection_data.id
+    a = storage.add_flashcard(collection_id, Question("manger"), Answer("to eat"))
+    b = storage.add_flashcard(collection_id, Question("boire"), Answer("to drink"))
+
+    storage.edit_flashcard(b.id, new_question="manger")
+    storage.delete_flashcard(a.id)
+    with pytest.raises(Flashcard.AlreadyExists):
+        storage.add_flashcard(collection_id, Question("manger"), Answer("to eat"))
+
+    storage.delete_flashcard(b.id)
+    storage.add_flashcard(collection_id, Question("manger"), Answer("to eat"))
+    assert _get_questions(storage, "french") == ["manger"]
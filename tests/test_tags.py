@@ -0,0 +1,114 @@
+import os
+import random
+
+import pytest
+
+from app.flashcard import Answer, Database, Question
+from app.in_memory_storage import InMemoryStorage
+from app.tags import TagAnd, TagAtom, TagExpression, TagNot, TagOr
+
+DB_SCHEMA_FILEPATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "db", "schema.sql"
+)
+TAG_NAMES = ["t0", "t1", "t2", "t3"]
+
+
+def test_not_binds_tighter_than_and_which_binds_tighter_than_or() -> None:
+    expression = TagExpression.parse("a OR NOT b AND c")
+
+    assert expression.root == TagOr(
+        [TagAtom("a"), TagAnd([TagNot(TagAtom("b")), TagAtom("c")])]
+    )
+
+
+def test_brackets_override_precedence() -> None:
+    expression = TagExpression.parse("(a OR b) AND NOT (c)")
+
+    assert expression.root == TagAnd(
+        [TagOr([TagAtom("a"), TagAtom("b")]), TagNot(TagAtom("c"))]
+    )
+
+
+def test_keywords_are_case_insensitive() -> None:
+    lower_case = TagExpression.parse("a and not b Or c")
+    upper_case = TagExpression.parse("a AND NOT b OR c")
+
+    assert lower_case.root == upper_case.root
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("", "Tag expression ended unexpectedly."),
+        ("a AND", "Tag expression ended unexpectedly."),
+        ("(a", "Tag expression ended unexpectedly."),
+        ("(a b", "Missing closing bracket."),
+        ("a)", "Unexpected ')'."),
+        ("a b", "Unexpected 'b'."),
+        ("OR a", "Expected a tag name but found 'OR'."),
+        ("()", "Expected a tag name but found ')'."),
+    ],
+)
+def test_invalid_expressions_are_rejected(expression: str, message: str) -> None:
+    with pytest.raises(TagExpression.InvalidExpression) as error:
+        TagExpression.parse(expression)
+
+    assert str(error.value) == message
+
+
+def test_to_sql_names_one_parameter_per_tag() -> None:
+    sql, params = TagExpression.parse("a AND NOT (b OR a)").to_sql()
+
+    assert params == {"tag_0": "a", "tag_1": "b", "tag_2": "a"}
+    assert sql.count("Flashcard.Id IN (") == 3
+    assert "NOT (" in sql
+
+
+def test_split_tag_names() -> None:
+    assert TagExpression.split_tag_names(" verb  french ") == ["verb", "french"]
+
+
+@pytest.mark.parametrize("tag_name", ["and", "Or", "NOT", "(verb", "verb)"])
+def test_split_tag_names_rejects_keywords_and_brackets(tag_name: str) -> None:
+    with pytest.raises(TagExpression.InvalidTagName):
+        TagExpression.split_tag_names(f"verb {tag_name}")
+
+
+def _random_expression(rng: random.Random, depth: int = 0) -> str:
+    choice = rng.random()
+    if depth >= 3 or choice < 0.3:
+        return rng.choice(TAG_NAMES)
+    if choice < 0.45:
+        return f"{rng.choice(['NOT', 'not'])} {_random_expression(rng, depth + 1)}"
+    if choice < 0.6:
+        return f"({_random_expression(rng, depth + 1)})"
+    operator = rng.choice(["AND", "OR", "and", "or"])
+    operands = [_random_expression(rng, depth + 1) for _ in range(rng.randint(2, 3))]
+    return f" {operator} ".join(operands)
+
+
+def test_sql_and_in_memory_evaluation_agree() -> None:
+    rng = random.Random(0)
+    database = Database.from_filepaths(":memory:", DB_SCHEMA_FILEPATH)
+    for collection_name in ("c0", "c1"):
+        collection = database.create_collection(collection_name)
+        for i in range(16):
+            flashcard = database.add_flashcard(
+                collection.collection_data.id,
+                Question(f"{collection_name} q{i}"),
+                Answer("a"),
+            )
+            tag_names = [name for bit, name in enumerate(TAG_NAMES) if i & (1 << bit)]
+            database.tag_flashcard(flashcard.id, tag_names)
+    in_memory_storage = InMemoryStorage.from_storage(database)
+
+    for _ in range(2000):
+        expression = TagExpression.parse(_random_expression(rng))
+        collection_name = rng.choice([None, "c0", "c1"])
+
+        in_database = database.get_tagged_flashcards(expression, collection_name)
+        in_memory = in_memory_storage.get_tagged_flashcards(expression, collection_name)
+
+        assert [flashcard.id for flashcard in in_database] == [
+            flashcard.id for flashcard in in_memory
+        ], str(expression)